@@ -1,23 +1,50 @@
-﻿from flask import Flask, jsonify, request, send_from_directory
+﻿from flask import Flask, Response, jsonify, request, send_file, send_from_directory
 import os
+import atexit
+import gzip
+import hmac
 import json
+import random
+import shutil
 from pathlib import Path
 from notion_client import Client
 from dotenv import load_dotenv
-from difflib import get_close_matches
-from typing import List
+from difflib import SequenceMatcher, get_close_matches
+from typing import Any, DefaultDict, Dict, Iterable, List, Tuple
 import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when unavailable
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process as rf_process
+except ImportError:  # optional prefilter for fuzzy_matches; difflib scores every candidate when unavailable
+    fuzz = None
+    rf_process = None
 
 # Load environment variables
 load_dotenv()
 
 # --- Notion API setup ---
+try:
+    # One pooled client and request budget per token, shared with the push/pull/publish-all syncs
+    from scripts.notion_sync import get_client as get_notion_client, get_rate_limiter
+except Exception:  # notion sync utilities unavailable; the index sync falls back to a plain client
+    get_notion_client = None
+    get_rate_limiter = None
+
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 notion = None
 if NOTION_TOKEN:
     try:
-        notion = Client(auth=NOTION_TOKEN)
+        notion = get_notion_client(NOTION_TOKEN) if get_notion_client is not None else Client(auth=NOTION_TOKEN)
     except Exception as e:
         print(f"Warning: Failed to initialize Notion client: {e}")
 else:
@@ -31,6 +58,9 @@ NOTION_DATABASES = {
     "realms": os.getenv("REALMS_DB_ID"),
 }
 
+# Optional shared secret for the batch sync endpoints (see _check_secret)
+SYNC_SECRET = os.getenv("SYNC_SECRET")
+
 # Sanity check (warn instead of crash for optional DBs)
 for category, db_id in NOTION_DATABASES.items():
     if not db_id:
@@ -42,7 +72,72 @@ app = Flask(__name__)
 # Paths
 LORE_ROOT = Path("lore")
 INDEX_DIR = LORE_ROOT / "indexes"
-CATEGORIES = ["characters", "creatures", "magic", "plots", "realms"]
+LOOKUP_PATH = LORE_ROOT / "lookup.json"
+# String prefix of paths under LORE_ROOT, used to derive relative paths without Path.relative_to
+_LORE_PREFIX = str(LORE_ROOT) + os.sep
+
+CATEGORIES = ("characters", "creatures", "magic", "plots", "realms")
+# URL converter matching only known categories, so the router rejects anything else
+CATEGORY_CONVERTER = f"any({','.join(CATEGORIES)})"
+
+
+def lore_relpath(path) -> str:
+    """Return path relative to LORE_ROOT as a string (raises ValueError for paths outside it)."""
+    s = str(path)
+    if s.startswith(_LORE_PREFIX):
+        return s[len(_LORE_PREFIX):]
+    return str(Path(s).relative_to(LORE_ROOT))
+
+
+class _SafeNameTable(dict):
+    """str.translate table: ASCII alnum and "._-" pass through, other ASCII becomes "_",
+    non-ASCII characters are resolved with str.isalnum() on first use and cached."""
+
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        out = ch if ch.isalnum() else "_"
+        self[code] = out
+        return out
+
+
+_SAFE_TABLE = _SafeNameTable({i: "_" for i in range(128)})
+for _c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-":
+    _SAFE_TABLE[ord(_c)] = _c
+del _c
+
+
+def safe_filename(name: str) -> str:
+    """Replace every character that is not alphanumeric or one of "._-" with "_"."""
+    return name.translate(_SAFE_TABLE)
+
+
+def list_json(dirpath) -> List[Path]:
+    """List the *.json files directly inside dirpath (empty if it is missing or not a directory, as with Path.glob)."""
+    try:
+        with os.scandir(dirpath) as it:
+            return [Path(e.path) for e in it if e.name.endswith(".json") and e.is_file(follow_symlinks=False)]
+    except OSError:
+        return []
+
+
+def count_json_files(dirpath, limit: int) -> int:
+    """Count *.json files anywhere under dirpath, stopping as soon as `limit` is reached."""
+    count = 0
+    pending = [dirpath]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        pending.append(e.path)
+                    elif e.name.endswith(".json"):
+                        count += 1
+                        if count >= limit:
+                            return count
+        except OSError:
+            continue
+    return count
+
 
 # Import normalizer utilities (for normalization routes)
 try:
@@ -100,6 +195,21 @@ except Exception as e:
     print(f"Warning: plots normalizer not available: {e}")
     normalize_plots_file = None
 
+
+@lru_cache(maxsize=16)
+def _load_synonyms_at(loader, path_str: str, mtime_ns):
+    return loader(Path(path_str))
+
+
+def cached_synonyms(loader, path: Path):
+    """Call a normalizer's load_synonyms, reusing the result until the mappings file changes."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _load_synonyms_at(loader, str(path), mtime_ns)
+
+
 # Notion full sync utilities (characters)
 try:
     from scripts.notion_sync import (
@@ -145,99 +255,493 @@ except Exception as e:
     pull_magic_full = None
     ensure_magic_schema = None
 
+# -------- JSON HELPERS --------
+def load_json(path) -> Any:
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json(path: Path, obj: Any) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+def dump_json_list(path: Path, key: str, entries: Iterable[Any]) -> None:
+    """Write {key: [entries...]} one entry at a time, matching dump_json's indent=2 layout.
+
+    Avoids holding the whole serialized document in memory for large combined outputs.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        dumps = partial(orjson.dumps, option=orjson.OPT_INDENT_2)
+    else:
+        dumps = lambda e: json.dumps(e, indent=2, ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(b"{\n  " + dumps(key) + b": [")
+        sep = b"\n    "
+        for e in entries:
+            # Raw newlines only occur between tokens, so re-indenting is safe
+            f.write(sep + dumps(e).replace(b"\n", b"\n    "))
+            sep = b",\n    "
+        f.write(b"\n  ]\n}" if sep != b"\n    " else b"]\n}")
+
+
+def is_compact_source(path: Path) -> bool:
+    """True when a source file was already rewritten by a refactor to its compact {"note", "total", ...} form."""
+    try:
+        data = load_json(path)
+    except (OSError, ValueError):
+        return False
+    return isinstance(data, dict) and "note" in data and "total" in data
+
+
+def backup_file(src: Path, bak: Path) -> None:
+    """Copy src to bak byte for byte, keeping its mtime; skipped when bak already matches src's size and mtime."""
+    s = src.stat()
+    try:
+        b = bak.stat()
+        if b.st_size == s.st_size and b.st_mtime_ns == s.st_mtime_ns:
+            return
+    except FileNotFoundError:
+        pass
+    shutil.copy2(src, bak)
+
+
+# Worker count for writing split JSON files in the normalize/refactor routes
+JSON_WRITE_WORKERS = 8
+
+
+def write_json_files(items: List[Tuple[Path, Any]]) -> List[str]:
+    """Write (path, data) pairs concurrently and return the paths as strings, in order.
+
+    Later duplicates of a path win, matching what sequential writes would leave on disk.
+    """
+    latest: Dict[Path, Any] = {}
+    for path, data in items:
+        latest.pop(path, None)
+        latest[path] = data
+    for parent in {path.parent for path in latest}:
+        parent.mkdir(parents=True, exist_ok=True)
+    if latest:
+        with ThreadPoolExecutor(max_workers=min(JSON_WRITE_WORKERS, len(latest))) as ex:
+            list(ex.map(lambda kv: dump_json(*kv), latest.items()))
+    return [str(path) for path, _ in items]
+
+
+def json_response(data: Any, status: int = 200) -> Response:
+    """Serialize data with orjson when available, skipping Flask's pure-Python encoder."""
+    if orjson is None:
+        resp = jsonify(data)
+        resp.status_code = status
+        return resp
+    return Response(orjson.dumps(data), status=status, mimetype="application/json")
+
+
+# Static error bodies, encoded once for the common reject paths
+ERR_MASTER_NOT_FOUND = b'{"error":"masterindex.json not found"}'
+ERR_NOTION_CLIENT_UNAVAILABLE = b'{"error":"Notion client not available in this runtime"}'
+ERR_NOTION_SYNC_UNAVAILABLE = b'{"error":"Notion sync module not available"}'
+ERR_UNAUTHORIZED = b'{"error":"Unauthorized"}'
+
+
+def raw_json_response(body: bytes, status: int = 200) -> Response:
+    """Wrap an already-encoded JSON body in a Response."""
+    return Response(body, status=status, mimetype="application/json")
+
+
+# Index files at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_SIZE = 1024
+# Compressed file bodies keyed by path; reused while the file's mtime is unchanged.
+_GZIP_CACHE: Dict[Path, Tuple[int, bytes]] = {}
+
+
+def send_json_file(path: Path) -> Response:
+    """Serve a JSON file as-is (no parse/re-encode), with ETag and If-Modified-Since support.
+
+    Clients sending Accept-Encoding: gzip get a compressed copy, compressed once per file version.
+    """
+    st = path.stat()
+    if st.st_size < GZIP_MIN_SIZE or not request.accept_encodings["gzip"]:
+        resp = send_file(path.resolve(), mimetype="application/json", conditional=True, etag=True)
+        resp.vary.add("Accept-Encoding")
+        return resp
+    cached = _GZIP_CACHE.get(path)
+    if cached is None or cached[0] != st.st_mtime_ns:
+        cached = (st.st_mtime_ns, gzip.compress(path.read_bytes(), compresslevel=6))
+        _GZIP_CACHE[path] = cached
+    resp = Response(cached[1], mimetype="application/json")
+    resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+    resp.set_etag(f"{st.st_mtime_ns:x}-{st.st_size:x}-gzip")
+    resp.last_modified = st.st_mtime
+    return resp.make_conditional(request)
+
+
+# Parsed JSON keyed by path; entries are reused while the file's mtime is unchanged.
+_INDEX_CACHE: Dict[Path, Tuple[int, Any]] = {}
+
+
+def load_json_cached(path: Path) -> Any:
+    """Load JSON from path, reusing the parsed value until the file changes on disk.
+
+    Callers must treat the returned object as read-only since it is shared between requests.
+    """
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _INDEX_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    data = load_json(path)
+    _INDEX_CACHE[path] = (mtime_ns, data)
+    return data
+
+
+# Lore files served by /getLore; bounded, since unlike the indexes there can be thousands of them
+LORE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=LORE_CACHE_SIZE)
+def _load_lore_at(path_str: str, mtime_ns: int) -> Any:
+    return load_json(Path(path_str))
+
+
+def load_lore_cached(path: Path) -> Any:
+    """Load a lore file, reusing the parsed value until it changes; read-only like load_json_cached."""
+    return _load_lore_at(str(path), path.stat().st_mtime_ns)
+
+
+def dump_json_cached(path: Path, obj: Any) -> None:
+    """Write obj with dump_json and keep it as the cached value for path, so the next read skips the parse."""
+    dump_json(path, obj)
+    _INDEX_CACHE[path] = (path.stat().st_mtime_ns, obj)
+
+
 # -------- INDEXING --------
+def _category_source_dir(category) -> Path:
+    formatted_path = LORE_ROOT / category / "formatted"
+    return formatted_path if formatted_path.exists() else (LORE_ROOT / category)
+
+
+def _file_version_ns(st: os.stat_result) -> int:
+    """Newest of mtime and ctime; ctime moves on every write, even when mtime is preserved (cp -p, restores)."""
+    return max(st.st_mtime_ns, st.st_ctime_ns)
+
+
+def _category_source_signature(category) -> List[int]:
+    """[newest change time, file count, total size] across the folders and files one category index is built from.
+
+    Folder times are included so that added, removed or renamed files also count as changes.
+    """
+    folder_path = _category_source_dir(category)
+    newest = 0
+    count = 0
+    total_size = 0
+    for folder in {LORE_ROOT / category, folder_path}:
+        try:
+            newest = max(newest, _file_version_ns(folder.stat()))
+        except OSError:
+            pass
+    try:
+        with os.scandir(folder_path) as it:
+            for e in it:
+                if e.name.endswith(".json") and e.is_file(follow_symlinks=False):
+                    st = e.stat(follow_symlinks=False)
+                    newest = max(newest, _file_version_ns(st))
+                    count += 1
+                    total_size += st.st_size
+    except OSError:
+        pass
+    return [newest, count, total_size]
+
+
+def _source_signature() -> List[List[int]]:
+    return [_category_source_signature(c) for c in CATEGORIES]
+
+
+# Worker count for reading lore files while building one category index
+INDEX_READ_WORKERS = 8
+# Built index per category, reused while _category_source_signature is unchanged
+_CATEGORY_INDEX_CACHE: Dict[str, Tuple[List[int], List[Dict[str, Any]]]] = {}
+
+
+def _read_index_names(category, file_path, file_name):
+    """Return (entry names in one lore file, whether it parsed cleanly); names read before an error are kept."""
+    names = []
+    try:
+        data = load_json(file_path)
+
+        # Handle dicts that contain lists (like characters, plots, etc.)
+        if isinstance(data, dict) and category in data:
+            for entry in data[category]:
+                entry_name = entry.get("name")
+                if not entry_name:
+                    continue
+                names.append(entry_name)
+        else:
+            names.append(data.get("name") or file_name[:-len(".json")])
+    except Exception as e:
+        print(f"âš ï¸ Error reading {file_path}: {e}")
+        return names, False
+    return names, True
+
+
+def _index_filecache_path(category) -> Path:
+    return INDEX_DIR / f".cache_{category}.json"
+
+
 def build_category_index(category):
     """Build index of entries from JSON files inside category folder.
 
     Preference order: lore/<category>/formatted/*.json if exists; otherwise lore/<category>/*.json
     """
-    formatted_path = LORE_ROOT / category / "formatted"
-    folder_path = formatted_path if formatted_path.exists() else (LORE_ROOT / category)
+    source_signature = _category_source_signature(category)
+    cached = _CATEGORY_INDEX_CACHE.get(category)
+    if cached is not None and cached[0] == source_signature:
+        return cached[1]
+
+    folder_path = _category_source_dir(category)
     index = []
 
     if not folder_path.exists():
         return []
 
-    for file in sorted(folder_path.glob("*.json")):
+    with os.scandir(folder_path) as it:
+        files = [
+            (e.path, e.name, lore_relpath(e.path), e.stat(follow_symlinks=False))
+            for e in it if e.name.endswith(".json") and e.is_file(follow_symlinks=False)
+        ]
+
+    # Sidecar cache {relative file: [version_ns, size, names]}; unchanged files are not re-parsed
+    cache_path = _index_filecache_path(category)
+    try:
+        file_cache = load_json(cache_path)
+    except Exception:
+        file_cache = {}
+    new_cache = {}
+    names_per_file: List[Any] = [None] * len(files)
+    to_read = []
+    for i, (_path, _name, rel_file, st) in enumerate(files):
+        hit = file_cache.get(rel_file)
+        if hit and hit[0] == _file_version_ns(st) and hit[1] == st.st_size:
+            names_per_file[i] = hit[2]
+            new_cache[rel_file] = hit
+        else:
+            to_read.append(i)
+
+    # Per-file reads are independent; overlap them
+    if to_read:
+        with ThreadPoolExecutor(max_workers=INDEX_READ_WORKERS) as ex:
+            results = ex.map(lambda i: _read_index_names(category, files[i][0], files[i][1]), to_read)
+            for i, (names, ok) in zip(to_read, results):
+                names_per_file[i] = names
+                if ok:
+                    st = files[i][3]
+                    new_cache[files[i][2]] = [_file_version_ns(st), st.st_size, names]
+
+    for (_path, _name, rel_file, _st), names in zip(files, names_per_file):
+        for entry_name in names:
+            index.append({
+                "name": entry_name,
+                "file": rel_file,
+                "category": category
+            })
+
+    if new_cache != file_cache:
         try:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Handle dicts that contain lists (like characters, plots, etc.)
-            if isinstance(data, dict) and category in data:
-                for entry in data[category]:
-                    entry_name = entry.get("name")
-                    if not entry_name:
-                        continue
-                    index.append({
-                        "name": entry_name,
-                        "file": str(file.relative_to(LORE_ROOT)),
-                        "category": category
-                    })
-            else:
-                entry_name = data.get("name") or file.stem
-                index.append({
-                    "name": entry_name,
-                    "file": str(file.relative_to(LORE_ROOT)),
-                    "category": category
-                })
-        except Exception as e:
-            print(f"âš ï¸ Error reading {file}: {e}")
-            continue
+            dump_json(cache_path, new_cache)
+        except OSError as e:
+            print(f"Failed to save index cache for {category}: {e}")
 
+    # Directory order is arbitrary; sort by (name, file) so index output stays deterministic
+    index.sort(key=lambda d: (d["name"], d["file"]))
+    _CATEGORY_INDEX_CACHE[category] = (source_signature, index)
     return index
 
 
+def _build_and_write_index(category):
+    """Build one category index and write it to INDEX_DIR; returns (category, index, stats)."""
+    index = build_category_index(category)
+    index_file = INDEX_DIR / f"{category}_index.json"
+    dump_json_cached(index_file, index)
+    stats = {
+        "index_file": lore_relpath(index_file),
+        "entry_count": len(index),
+    }
+    return category, index, stats
+
+
 def generate_master_index():
-    """Generate per-category indexes and master index with cross-links."""
+    """Generate per-category indexes and master index with cross-links.
+
+    Returns the existing master index untouched when no source file changed since it was written.
+    """
+    master_path = LORE_ROOT / "masterindex.json"
+    source_signature = _source_signature()
+    outputs = [master_path, LOOKUP_PATH] + [INDEX_DIR / f"{c}_index.json" for c in CATEGORIES]
+    if all(p.exists() for p in outputs):
+        try:
+            stored = load_json_cached(master_path)
+        except Exception:
+            stored = None
+        if isinstance(stored, dict) and stored.get("source_signature") == source_signature:
+            return stored
+
     INDEX_DIR.mkdir(exist_ok=True, parents=True)
     master_index = {}
+    per_category_entries = {}
 
-    for category in CATEGORIES:
-        index = build_category_index(category)
-        index_file = INDEX_DIR / f"{category}_index.json"
-        with open(index_file, "w", encoding="utf-8") as f:
-            json.dump(index, f, indent=2)
-
-        master_index[category] = {
-            "index_file": str(index_file.relative_to(LORE_ROOT)),
-            "entry_count": len(index),
-        }
+    # Categories are independent (separate folders and index files), so build them concurrently
+    with ThreadPoolExecutor(max_workers=len(CATEGORIES)) as ex:
+        built = list(ex.map(_build_and_write_index, CATEGORIES))
 
-    # Simple cross-linking by entry name appearing in multiple categories
-    crosslinks = {}
-    name_to_category = {}
-    for category in CATEGORIES:
-        path = INDEX_DIR / f"{category}_index.json"
-        if path.exists():
-            entries = json.load(open(path, "r", encoding="utf-8"))
-            for e in entries:
-                n = e["name"]
-                if n not in name_to_category:
-                    name_to_category[n] = []
-                name_to_category[n].append({"category": category, "file": e["file"]})
+    for category, index, stats in built:
+        per_category_entries[category] = index
+        master_index[category] = stats
 
-    for name, cats in name_to_category.items():
-        if len(cats) > 1:
-            crosslinks[name] = cats
+    # Simple cross-linking by entry name appearing in multiple categories.
+    # Uses the indexes built above rather than re-reading the files just written.
+    name_to_category: DefaultDict[str, List[Dict[str, str]]] = defaultdict(list)
+    for category, entries in per_category_entries.items():
+        for e in entries:
+            name_to_category[e["name"]].append({"category": category, "file": e["file"]})
 
-    master_index["crosslinks"] = crosslinks
+    master_index["crosslinks"] = {name: cats for name, cats in name_to_category.items() if len(cats) > 1}
+    master_index["source_signature"] = source_signature
 
     # Write master index
-    master_path = LORE_ROOT / "masterindex.json"
-    with open(master_path, "w", encoding="utf-8") as f:
-        json.dump(master_index, f, indent=2)
+    dump_json_cached(master_path, master_index)
+
+    # Flat name -> first location map so /getLore is a single dict lookup
+    lookup = {name: cats[0] for name, cats in name_to_category.items()}
+    dump_json_cached(LOOKUP_PATH, lookup)
+
+    _SEARCH_CORPUS.clear()
 
     return master_index
 
 
 # -------- NOTION SYNC --------
+# Concurrent page updates/creates per index sync; the client's NOTION_RATE_LIMIT budget still caps throughput
+NOTION_SYNC_WORKERS = max(1, int(os.getenv("NOTION_SYNC_WORKERS", "3")))
+
+
+# Retries for rate-limited (429) or unavailable (503) Notion responses; both mean the request
+# was not processed, so retrying a page create cannot duplicate it
+NOTION_MAX_RETRIES = 3
+_RETRYABLE_STATUS = (429, 503)
+# Statuses returned when updating a page that was archived (400) or deleted (404) in Notion
+_STALE_PAGE_STATUS = (400, 404)
+
+
+def _notion_call(fn, **kwargs):
+    """Call a Notion endpoint, retrying retryable statuses.
+
+    Honors the Retry-After header when Notion sends one, otherwise backs off exponentially.
+    Throttling happens in the client itself, so retries draw from the same budget.
+    """
+    for attempt in range(NOTION_MAX_RETRIES + 1):
+        try:
+            return fn(**kwargs)
+        except Exception as e:
+            status = getattr(e, "status", None)
+            if status not in _RETRYABLE_STATUS or attempt == NOTION_MAX_RETRIES:
+                raise
+            headers = getattr(e, "headers", None) or {}
+            try:
+                delay = float(headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                delay = 0.5 * (2 ** attempt)
+            time.sleep(delay)
+
+
+def _index_syncstate_path(category: str) -> Path:
+    return LORE_ROOT / f".syncstate_index_{category}.json"
+
+
+def _load_index_syncstate(category: str) -> Dict[str, Any]:
+    p = _index_syncstate_path(category)
+    if p.exists():
+        try:
+            return load_json(p)
+        except Exception:
+            return {}
+    return {}
+
+
+def _fetch_existing_pages(db_id, edited_since=None):
+    """Return {title: page_id} for pages in the database (one paginated scan).
+
+    With edited_since (ISO 8601), only pages edited on or after that time are returned.
+    """
+    existing = {}
+    start_cursor = None
+    while True:
+        kwargs = {"database_id": db_id, "page_size": 100}
+        if edited_since:
+            kwargs["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": edited_since}}
+        if start_cursor:
+            kwargs["start_cursor"] = start_cursor
+        page = _notion_call(notion.databases.query, **kwargs)
+        for result in page.get("results", []):
+            title = result.get("properties", {}).get("Name", {}).get("title") or []
+            name = "".join(t.get("plain_text", "") for t in title)
+            if name:
+                existing.setdefault(name, result["id"])
+        if not page.get("has_more"):
+            break
+        start_cursor = page.get("next_cursor")
+    return existing
+
+
+def _sync_one(entry, db_id, category, existing):
+    """Create or update one entry's page; returns the page id, or None on failure."""
+    try:
+        page_id = existing.get(entry["name"])
+        if page_id:
+            # Update existing
+            try:
+                _notion_call(
+                    notion.pages.update,
+                    page_id=page_id,
+                    properties={
+                        "File Path": {
+                            "rich_text": [{"text": {"content": entry["file"]}}]
+                        }
+                    }
+                )
+            except Exception as e:
+                # Remembered ids may point at pages archived or deleted in Notion since; create those again
+                if getattr(e, "status", None) not in _STALE_PAGE_STATUS:
+                    raise
+                page_id = None
+        if not page_id:
+            # Create new
+            page_id = _notion_call(
+                notion.pages.create,
+                parent={"database_id": db_id},
+                properties={
+                    "Name": {"title": [{"text": {"content": entry["name"]}}]},
+                    "Category": {"select": {"name": category.capitalize()}},
+                    "File Path": {
+                        "rich_text": [{"text": {"content": entry["file"]}}]
+                    }
+                }
+            )["id"]
+        return page_id
+    except Exception as e:
+        print(f"âŒ Failed to sync {entry['name']}: {e}")
+        return None
+
+
 def sync_index_to_notion(category):
     """Sync entries to Notion DB (create or update)."""
     # Guard if Notion client not initialized
-    try:
-        _ = notion  # type: ignore
-    except NameError:
+    if notion is None:
         return {"error": "Notion client not available in this runtime"}
     db_id = NOTION_DATABASES.get(category)
     if not db_id:
@@ -247,43 +751,60 @@ def sync_index_to_notion(category):
     if not index_file.exists():
         return {"error": f"Index file for '{category}' not found"}
 
-    entries = json.load(open(index_file, "r", encoding="utf-8"))
-    synced = 0
-
+    entries = load_json_cached(index_file)
+    started = datetime.now(timezone.utc)
+    started_ns = time.time_ns()
+
+    # Incremental: only entries that are new to Notion, whose file path moved, or whose file changed
+    # since the last sync (by mtime/ctime, so overwrites that preserve mtime still count)
+    state = _load_index_syncstate(category)
+    pages: Dict[str, str] = dict(state.get("pages") or {})
+    files: Dict[str, str] = dict(state.get("files") or {})
+    last_sync = state.get("last_sync")
+    last_sync_ns = state.get("last_sync_ns") or 0
+    pending = []
     for entry in entries:
+        if entry["name"] in pages and files.get(entry["name"]) == entry["file"] and last_sync_ns:
+            try:
+                if _file_version_ns(os.stat(LORE_ROOT / entry["file"])) < last_sync_ns:
+                    continue
+            except OSError:
+                pass
+        pending.append(entry)
+
+    synced = 0
+    if pending:
+        # One paginated scan replaces a per-entry "does this page exist?" query; pages already
+        # known from earlier syncs only need refreshing for what was edited since then.
+        # A pending name this function has not synced before may still exist in Notion (e.g. it arrived
+        # through a pull), so any such name needs the full scan to avoid creating a duplicate page.
+        incremental = bool(last_sync) and all(entry["name"] in pages for entry in pending)
         try:
-            # Check if entry already exists in Notion
-            results = notion.databases.query(
-                database_id=db_id,
-                filter={"property": "Name", "title": {"equals": entry["name"]}}
-            )
-
-            if results["results"]:
-                # Update existing
-                page_id = results["results"][0]["id"]
-                notion.pages.update(
-                    page_id=page_id,
-                    properties={
-                        "File Path": {
-                            "rich_text": [{"text": {"content": entry["file"]}}]
-                        }
-                    }
-                )
-            else:
-                # Create new
-                notion.pages.create(
-                    parent={"database_id": db_id},
-                    properties={
-                        "Name": {"title": [{"text": {"content": entry["name"]}}]},
-                        "Category": {"select": {"name": category.capitalize()}},
-                        "File Path": {
-                            "rich_text": [{"text": {"content": entry["file"]}}]
-                        }
-                    }
-                )
-            synced += 1
+            existing = dict(pages) if incremental else {}
+            existing.update(_fetch_existing_pages(db_id, edited_since=last_sync if incremental else None))
         except Exception as e:
-            print(f"âŒ Failed to sync {entry['name']}: {e}")
+            return {"error": f"Failed to query Notion DB for '{category}': {e}"}
+
+        with ThreadPoolExecutor(max_workers=NOTION_SYNC_WORKERS) as ex:
+            page_ids = list(ex.map(lambda e: _sync_one(e, db_id, category, existing), pending))
+
+        for entry, page_id in zip(pending, page_ids):
+            if page_id:
+                pages[entry["name"]] = page_id
+                files[entry["name"]] = entry["file"]
+                synced += 1
+        if synced < len(pending):
+            # Keep the previous watermark so failed entries are retried next time
+            started = None
+
+    new_state = {"pages": pages, "files": files, "last_sync": last_sync, "last_sync_ns": last_sync_ns}
+    if started is not None:
+        new_state["last_sync"] = started.isoformat()
+        new_state["last_sync_ns"] = started_ns
+    try:
+        dump_json(_index_syncstate_path(category), new_state)
+    except Exception as e:
+        print(f"Failed to save sync state for {category}: {e}")
 
     return {"status": f"âœ… Synced {synced} {category} entries", "count": synced}
 
@@ -297,86 +818,152 @@ def home():
 @app.route('/generate-indexes', methods=['POST', 'GET'])
 def generate_indexes():
     master_index = generate_master_index()
-    return jsonify({"status": "âœ… Indexes generated", "masterindex": master_index})
+    return json_response({"status": "âœ… Indexes generated", "masterindex": master_index})
 
 
 @app.route('/get-masterindex', methods=['GET'])
 def get_masterindex():
     path = LORE_ROOT / "masterindex.json"
     if path.exists():
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return jsonify(data)
-    return jsonify({"error": "masterindex.json not found"}), 404
+        return send_json_file(path)
+    return raw_json_response(ERR_MASTER_NOT_FOUND, 404)
 
 
-@app.route('/get-index/<category>', methods=['GET'])
+@app.route(f'/get-index/<{CATEGORY_CONVERTER}:category>', methods=['GET'])
 def get_category_index(category):
-    if category not in CATEGORIES:
-        return jsonify({"error": f"Unknown category '{category}'"}), 400
-
     path = INDEX_DIR / f"{category}_index.json"
     if not path.exists():
-        return jsonify({"error": f"No index file for '{category}'"}), 404
+        return json_response({"error": f"No index file for '{category}'"}, 404)
 
-    with open(path, "r", encoding="utf-8") as f:
-        index_data = json.load(f)
-    return jsonify(index_data)
+    return send_json_file(path)
 
 
 # -------- SEARCH --------
+# Per-category (entries, names, name -> entry), rebuilt when the cached index object changes.
+_SEARCH_CORPUS: Dict[str, Tuple[Any, List[str], Dict[str, Any]]] = {}
+
+
+def get_search_corpus(category):
+    """Return (entries, names, name -> entry) for a category, or None without an index."""
+    path = INDEX_DIR / f"{category}_index.json"
+    if not path.exists():
+        return None
+    entries = load_json_cached(path)
+    cached = _SEARCH_CORPUS.get(category)
+    if cached is not None and cached[0] is entries:
+        return cached
+    names = [e["name"] for e in entries]
+    by_name: Dict[str, Any] = {}
+    for e in entries:
+        by_name.setdefault(e["name"], e)
+    corpus = (entries, names, by_name)
+    _SEARCH_CORPUS[category] = corpus
+    return corpus
+
+
+def fuzzy_matches(query: str, choices: List[str], limit: int, cutoff: float) -> List[Tuple[str, int]]:
+    """Return up to `limit` (choice, position) pairs scoring at least `cutoff` (0..1), best first.
+
+    Results are exactly those of difflib.get_close_matches; rapidfuzz only narrows the candidates.
+    """
+    if rf_process is None:
+        positions = {}
+        for i, c in enumerate(choices):
+            positions.setdefault(c, i)
+        return [(m, positions[m]) for m in get_close_matches(query, choices, n=limit, cutoff=cutoff)]
+    # fuzz.ratio is LCS-based and never scores below difflib's ratio, so it is a safe prefilter;
+    # the survivors are rescored with SequenceMatcher so scores and tie order match the difflib path.
+    found = rf_process.extract(
+        query, choices, scorer=fuzz.ratio, processor=None, limit=None, score_cutoff=cutoff * 100 - 1e-6
+    )
+    matcher = SequenceMatcher()
+    matcher.set_seq2(query)
+    scored = []
+    for match, _score, idx in found:
+        matcher.set_seq1(match)
+        ratio = matcher.ratio()
+        if ratio >= cutoff:
+            scored.append((ratio, match, idx))
+    scored.sort(key=lambda t: (t[0], t[1]), reverse=True)
+    return [(match, idx) for _ratio, match, idx in scored[:limit]]
+
+
 @app.route('/search/<term>', methods=['GET'])
 def search(term):
-    """Fuzzy search across all indexes."""
+    """Fuzzy search across all indexes.
+
+    An exact name hit in any category short-circuits fuzzy scoring entirely.
+    """
+    corpora = [(c, get_search_corpus(c)) for c in CATEGORIES]
+    corpora = [(c, corpus) for c, corpus in corpora if corpus is not None]
+
+    exact = [{**corpus[2][term], "category": c} for c, corpus in corpora if term in corpus[2]]
+    if exact:
+        return json_response(exact)
+
     results = []
-    for category in CATEGORIES:
-        path = INDEX_DIR / f"{category}_index.json"
-        if not path.exists():
-            continue
-        entries = json.load(open(path, "r", encoding="utf-8"))
-        names = [e["name"] for e in entries]
-        matches = get_close_matches(term, names, n=5, cutoff=0.5)
-        for match in matches:
-            match_entry = next((e for e in entries if e["name"] == match), None)
-            if match_entry:
-                results.append({**match_entry, "category": category})
-    return jsonify(results)
+    for category, (entries, names, _by_name) in corpora:
+        for _match, idx in fuzzy_matches(term, names, limit=5, cutoff=0.5):
+            results.append({**entries[idx], "category": category})
+    return json_response(results)
 
 
 # -------- CROSSLINK RESOLVER --------
+# (crosslinks object, keys, lowercase key -> key), rebuilt when the masterindex changes.
+_CROSSLINK_KEYS: Dict[str, Tuple[Any, List[str], Dict[str, str]]] = {}
+
+
+def get_crosslink_keys(crosslinks):
+    cached = _CROSSLINK_KEYS.get("crosslinks")
+    if cached is not None and cached[0] is crosslinks:
+        return cached
+    keys = list(crosslinks)
+    lowered: Dict[str, str] = {}
+    for k in keys:
+        lowered.setdefault(k.lower(), k)
+    cached = (crosslinks, keys, lowered)
+    _CROSSLINK_KEYS["crosslinks"] = cached
+    return cached
+
+
 @app.route('/related/<name>', methods=['GET'])
 def related(name):
     """Return all categories/files where an entity appears (crosslinks)."""
     path = LORE_ROOT / "masterindex.json"
     if not path.exists():
-        return jsonify({"error": "masterindex.json not found"}), 404
+        return raw_json_response(ERR_MASTER_NOT_FOUND, 404)
 
-    with open(path, "r", encoding="utf-8") as f:
-        master_index = json.load(f)
+    master_index = load_json_cached(path)
 
     crosslinks = master_index.get("crosslinks", {})
     related_entries = crosslinks.get(name)
 
     if not related_entries:
+        _, keys, lowered = get_crosslink_keys(crosslinks)
+        # Case-insensitive exact hit before paying for fuzzy scoring
+        key = lowered.get(name.lower())
+        if key is not None:
+            return json_response({
+                "name": key,
+                "related": crosslinks[key]
+            })
         # fallback fuzzy search if not exact match
-        possible = get_close_matches(name, crosslinks.keys(), n=3, cutoff=0.6)
-        return jsonify({
+        possible = [match for match, _idx in fuzzy_matches(name, keys, limit=3, cutoff=0.6)]
+        return json_response({
             "status": "âŒ No exact match",
             "closest_matches": possible
         })
 
-    return jsonify({
+    return json_response({
         "name": name,
         "related": related_entries
     })
 
 
 # -------- SYNC ROUTES --------
-@app.route('/sync-<category>-to-notion', methods=['POST', 'GET'])
+@app.route(f'/sync-<{CATEGORY_CONVERTER}:category>-to-notion', methods=['POST', 'GET'])
 def sync_single(category):
-    if category not in CATEGORIES:
-        return jsonify({"error": f"Unknown category '{category}'"}), 400
-    return jsonify(sync_index_to_notion(category))
+    return json_response(sync_index_to_notion(category))
 
 
 @app.route('/sync-all-to-notion', methods=['POST', 'GET'])
@@ -385,322 +972,80 @@ def sync_all():
     try:
         _ = notion  # type: ignore
     except NameError:
-        return jsonify({"error": "Notion client not available in this runtime"}), 500
+        return raw_json_response(ERR_NOTION_CLIENT_UNAVAILABLE, 500)
     for category, db_id in NOTION_DATABASES.items():
         if db_id:  # only sync configured DBs
             results[category] = sync_index_to_notion(category)
         else:
             results[category] = {"status": "âš ï¸ Skipped (no DB ID configured)"}
-    return jsonify(results)
-
-
-# -------- CHARACTER FULL SYNC (JSON <-> Notion) --------
-@app.route('/push-characters-to-notion', methods=['POST', 'GET'])
-def push_characters_to_notion_route():
-    if push_chars_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = push_chars_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/pull-characters-from-notion', methods=['POST', 'GET'])
-def pull_characters_from_notion_route():
-    if pull_chars_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = pull_chars_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/ensure-characters-schema', methods=['POST', 'GET'])
-def ensure_characters_schema_route():
-    if ensure_chars_schema is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = ensure_chars_schema(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-# -------- CREATURES FULL SYNC --------
-@app.route('/ensure-creatures-schema', methods=['POST', 'GET'])
-def ensure_creatures_schema_route():
-    if ensure_creatures_schema is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = ensure_creatures_schema(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/push-creatures-to-notion', methods=['POST', 'GET'])
-def push_creatures_to_notion_route():
-    if push_creatures_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = push_creatures_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/pull-creatures-from-notion', methods=['POST', 'GET'])
-def pull_creatures_from_notion_route():
-    if pull_creatures_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = pull_creatures_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-# -------- REALMS FULL SYNC --------
-@app.route('/ensure-realms-schema', methods=['POST', 'GET'])
-def ensure_realms_schema_route():
-    if ensure_realms_schema is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = ensure_realms_schema(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/push-realms-to-notion', methods=['POST', 'GET'])
-def push_realms_to_notion_route():
-    if push_realms_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = push_realms_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/pull-realms-from-notion', methods=['POST', 'GET'])
-def pull_realms_from_notion_route():
-    if pull_realms_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = pull_realms_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-# -------- PLOTS FULL SYNC --------
-@app.route('/ensure-plots-schema', methods=['POST', 'GET'])
-def ensure_plots_schema_route():
-    if ensure_plots_schema is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = ensure_plots_schema(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/push-plots-to-notion', methods=['POST', 'GET'])
-def push_plots_to_notion_route():
-    if push_plots_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = push_plots_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route('/pull-plots-from-notion', methods=['POST', 'GET'])
-def pull_plots_from_notion_route():
-    if pull_plots_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = pull_plots_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-# -------- MAGIC FULL SYNC --------
-@app.route('/ensure-magic-schema', methods=['POST', 'GET'])
-def ensure_magic_schema_route():
-    if ensure_magic_schema is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = ensure_magic_schema(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return json_response(results)
+
+
+# -------- PER-CATEGORY FULL SYNC (JSON <-> Notion) --------
+# (category, ensure_schema, push, pull); entries are None when scripts.notion_sync is unavailable
+_FULL_SYNC_FUNCS = (
+    ("characters", ensure_chars_schema, push_chars_full, pull_chars_full),
+    ("creatures", ensure_creatures_schema, push_creatures_full, pull_creatures_full),
+    ("realms", ensure_realms_schema, push_realms_full, pull_realms_full),
+    ("magic", ensure_magic_schema, push_magic_full, pull_magic_full),
+    ("plots", ensure_plots_schema, push_plots_full, pull_plots_full),
+)
+
+
+def _make_full_sync_view(fn):
+    """Build a view that runs fn with the optional "mapping" path from the JSON body."""
+    def view():
+        if fn is None:
+            return raw_json_response(ERR_NOTION_SYNC_UNAVAILABLE, 500)
+        payload = request.get_json(silent=True) or {}
+        mapping_path = payload.get("mapping")
+        try:
+            mp = Path(mapping_path) if mapping_path else None
+            result = fn(mp)
+            return json_response({"status": "ok", **result})
+        except Exception as e:
+            return json_response({"error": str(e)}, 500)
+    return view
 
 
-@app.route('/push-magic-to-notion', methods=['POST', 'GET'])
-def push_magic_to_notion_route():
-    if push_magic_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = push_magic_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+def _register_full_sync_routes():
+    """/ensure-<category>-schema, /push-<category>-to-notion and /pull-<category>-from-notion."""
+    for category, ensure, push, pull in _FULL_SYNC_FUNCS:
+        for rule, endpoint, fn in (
+            (f"/ensure-{category}-schema", f"ensure_{category}_schema_route", ensure),
+            (f"/push-{category}-to-notion", f"push_{category}_to_notion_route", push),
+            (f"/pull-{category}-from-notion", f"pull_{category}_from_notion_route", pull),
+        ):
+            app.add_url_rule(rule, endpoint=endpoint, view_func=_make_full_sync_view(fn), methods=['POST', 'GET'])
 
 
-@app.route('/pull-magic-from-notion', methods=['POST', 'GET'])
-def pull_magic_from_notion_route():
-    if pull_magic_full is None:
-        return jsonify({"error": "Notion sync module not available"}), 500
-    payload = request.get_json(silent=True) or {}
-    mapping_path = payload.get("mapping")
-    try:
-        mp = Path(mapping_path) if mapping_path else None
-        result = pull_magic_full(mp)
-        return jsonify({"status": "ok", **result})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+_register_full_sync_routes()
 
 
 # -------- BATCH ENSURE + PUSH --------
 def _check_secret():
-    secret = os.getenv("SYNC_SECRET")
-    if not secret:
+    if not SYNC_SECRET:
         return True
-    # Allow either header or query param
-    header = request.headers.get("X-Sync-Secret")
-    param = request.args.get("secret")
-    return header == secret or param == secret
+    # Allow either header or query param; compare in constant time to avoid leaking the secret
+    secret = SYNC_SECRET.encode("utf-8")
+    for candidate in (request.headers.get("X-Sync-Secret"), request.args.get("secret")):
+        if candidate is not None and hmac.compare_digest(candidate.encode("utf-8"), secret):
+            return True
+    return False
 
 
 @app.route('/publish-all', methods=['POST', 'GET'])
 def publish_all():
     if not _check_secret():
-        return jsonify({"error": "Unauthorized"}), 401
-    results = {}
-    # Characters
-    if ensure_chars_schema and push_chars_full and os.getenv("CHARACTER_DB_ID"):
-        try:
-            ensure_res = ensure_chars_schema(None)
-            push_res = push_chars_full(None)
-            results["characters"] = {"ensure": ensure_res, "push": push_res}
-        except Exception as e:
-            results["characters"] = {"error": str(e)}
-    # Creatures
-    if ensure_creatures_schema and push_creatures_full and os.getenv("CREATURES_DB_ID"):
-        try:
-            ensure_res = ensure_creatures_schema(None)
-            push_res = push_creatures_full(None)
-            results["creatures"] = {"ensure": ensure_res, "push": push_res}
-        except Exception as e:
-            results["creatures"] = {"error": str(e)}
-    # Realms
-    if ensure_realms_schema and push_realms_full and os.getenv("REALMS_DB_ID"):
-        try:
-            ensure_res = ensure_realms_schema(None)
-            push_res = push_realms_full(None)
-            results["realms"] = {"ensure": ensure_res, "push": push_res}
-        except Exception as e:
-            results["realms"] = {"error": str(e)}
-    # Magic
-    if ensure_magic_schema and push_magic_full and os.getenv("MAGIC_DB_ID"):
-        try:
-            ensure_res = ensure_magic_schema(None)
-            push_res = push_magic_full(None)
-            results["magic"] = {"ensure": ensure_res, "push": push_res}
-        except Exception as e:
-            results["magic"] = {"error": str(e)}
-    # Plots
-    if ensure_plots_schema and push_plots_full and os.getenv("PLOTS_DB_ID"):
-        try:
-            ensure_res = ensure_plots_schema(None)
-            push_res = push_plots_full(None)
-            results["plots"] = {"ensure": ensure_res, "push": push_res}
-        except Exception as e:
-            results["plots"] = {"error": str(e)}
-
-    return jsonify({"status": "ok", "results": results})
+        return raw_json_response(ERR_UNAUTHORIZED, 401)
+    return json_response({"status": "ok", "results": _do_publish_all_internal()})
 
 
 @app.route('/pull-all', methods=['POST', 'GET'])
 def pull_all():
     if not _check_secret():
-        return jsonify({"error": "Unauthorized"}), 401
-    results = {}
-    if pull_chars_full and os.getenv("CHARACTER_DB_ID"):
-        try:
-            results["characters"] = pull_chars_full(None)
-        except Exception as e:
-            results["characters"] = {"error": str(e)}
-    if pull_creatures_full and os.getenv("CREATURES_DB_ID"):
-        try:
-            results["creatures"] = pull_creatures_full(None)
-        except Exception as e:
-            results["creatures"] = {"error": str(e)}
-    if pull_realms_full and os.getenv("REALMS_DB_ID"):
-        try:
-            results["realms"] = pull_realms_full(None)
-        except Exception as e:
-            results["realms"] = {"error": str(e)}
-    if pull_magic_full and os.getenv("MAGIC_DB_ID"):
-        try:
-            results["magic"] = pull_magic_full(None)
-        except Exception as e:
-            results["magic"] = {"error": str(e)}
-    if pull_plots_full and os.getenv("PLOTS_DB_ID"):
-        try:
-            results["plots"] = pull_plots_full(None)
-        except Exception as e:
-            results["plots"] = {"error": str(e)}
-
-    return jsonify({"status": "ok", "results": results})
+        return raw_json_response(ERR_UNAUTHORIZED, 401)
+    return json_response({"status": "ok", "results": _do_pull_all_internal()})
 
 
 # -------- AUTO SYNC SCHEDULER --------
@@ -711,52 +1056,72 @@ def _bool_env(name: str, default: bool = False) -> bool:
     return str(val).strip().lower() in ("1", "true", "yes", "on")
 
 
-def _do_publish_all_internal():
-    results = {}
+def _full_sync_table():
+    """_FULL_SYNC_FUNCS rows for categories with a configured Notion database."""
+    return tuple(row for row in _FULL_SYNC_FUNCS if NOTION_DATABASES.get(row[0]))
+
+
+def _publish_category(ensure, push):
     try:
-        if ensure_chars_schema and push_chars_full and os.getenv("CHARACTER_DB_ID"):
-            results["characters"] = {"ensure": ensure_chars_schema(None), "push": push_chars_full(None)}
-        if ensure_creatures_schema and push_creatures_full and os.getenv("CREATURES_DB_ID"):
-            results["creatures"] = {"ensure": ensure_creatures_schema(None), "push": push_creatures_full(None)}
-        if ensure_realms_schema and push_realms_full and os.getenv("REALMS_DB_ID"):
-            results["realms"] = {"ensure": ensure_realms_schema(None), "push": push_realms_full(None)}
-        if ensure_magic_schema and push_magic_full and os.getenv("MAGIC_DB_ID"):
-            results["magic"] = {"ensure": ensure_magic_schema(None), "push": push_magic_full(None)}
-        if ensure_plots_schema and push_plots_full and os.getenv("PLOTS_DB_ID"):
-            results["plots"] = {"ensure": ensure_plots_schema(None), "push": push_plots_full(None)}
+        return {"ensure": ensure(None), "push": push(None)}
     except Exception as e:
-        results["error"] = str(e)
-    return results
+        return {"error": str(e)}
 
 
-def _do_pull_all_internal():
-    results = {}
+def _pull_category(pull):
     try:
-        if pull_chars_full and os.getenv("CHARACTER_DB_ID"):
-            results["characters"] = pull_chars_full(None)
-        if pull_creatures_full and os.getenv("CREATURES_DB_ID"):
-            results["creatures"] = pull_creatures_full(None)
-        if pull_realms_full and os.getenv("REALMS_DB_ID"):
-            results["realms"] = pull_realms_full(None)
-        if pull_magic_full and os.getenv("MAGIC_DB_ID"):
-            results["magic"] = pull_magic_full(None)
-        if pull_plots_full and os.getenv("PLOTS_DB_ID"):
-            results["plots"] = pull_plots_full(None)
+        return pull(None)
     except Exception as e:
-        results["error"] = str(e)
-    return results
+        return {"error": str(e)}
+
+
+def _run_per_category(jobs):
+    """Run {category: job} concurrently; categories use separate databases and state files.
+
+    The jobs share the notion_sync client for the token, whose limiter keeps them within NOTION_RATE_LIMIT.
+    """
+    if not jobs:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+        futures = {category: ex.submit(job) for category, job in jobs.items()}
+        return {category: f.result() for category, f in futures.items()}
+
+
+def _do_publish_all_internal():
+    return _run_per_category({
+        category: partial(_publish_category, ensure, push)
+        for category, ensure, push, _ in _full_sync_table()
+        if ensure and push
+    })
+
+
+def _do_pull_all_internal():
+    return _run_per_category({
+        category: partial(_pull_category, pull)
+        for category, _, _, pull in _full_sync_table()
+        if pull
+    })
+
+
+# Set to stop the auto-sync worker before its next cycle; set at interpreter exit so a
+# shutdown never starts a new sync cycle
+_SCHEDULER_STOP = threading.Event()
+atexit.register(_SCHEDULER_STOP.set)
 
 
 def _start_scheduler_if_enabled():
     # Only run when a token is present and at least one DB ID is configured
-    if not os.getenv("NOTION_TOKEN"):
+    if not NOTION_TOKEN:
+        return
+    if not any(NOTION_DATABASES.values()):
         return
-    if not any(os.getenv(k) for k in [
-        "CHARACTER_DB_ID", "CREATURES_DB_ID", "REALMS_DB_ID", "MAGIC_DB_ID", "PLOTS_DB_ID"
-    ]):
+    # One worker per process: the module can be imported twice (as __main__ by `python app.py`
+    # and again as `app`), and each import would otherwise start its own scheduler
+    if any(t.name == "auto-sync" and t.is_alive() for t in threading.enumerate()):
         return
 
     interval_minutes = int(os.getenv("AUTO_SYNC_INTERVAL_MINUTES", "60"))
+    jitter_seconds = max(float(os.getenv("AUTO_SYNC_JITTER_SECONDS", "30")), 0.0)
     pull_on_start = _bool_env("AUTO_PULL_ON_START", True)
     publish_on_start = _bool_env("AUTO_PUBLISH_ON_START", False)
     pull_each_cycle = _bool_env("AUTO_PULL_EACH_CYCLE", True)
@@ -768,13 +1133,15 @@ def _start_scheduler_if_enabled():
                 return
             # If formatted creatures are missing or very few, attempt a refactor
             formatted = LORE_ROOT / "creatures" / "formatted"
-            existing = list(formatted.glob("**/*.json")) if formatted.exists() else []
+            existing = count_json_files(formatted, limit=5)
             src = LORE_ROOT / "creatures" / "creatures.json"
-            if len(existing) < 5 and src.exists() and normalize_creatures_file is not None:
+            # A compact source has no entries left; re-running would replace the .bak with the compact index
+            if (existing < 5 and src.exists() and normalize_creatures_file is not None
+                    and not is_compact_source(src)):
                 # Load synonyms
                 default_map = LORE_ROOT / "creatures" / "mappings.json"
                 try:
-                    syn = load_creatures_synonyms(default_map)
+                    syn = cached_synonyms(load_creatures_synonyms, default_map)
                     set_creatures_synonyms(syn)
                 except Exception:
                     pass
@@ -782,31 +1149,32 @@ def _start_scheduler_if_enabled():
                 entries = normalize_creatures_file(src)
                 outdir = formatted
                 outdir.mkdir(parents=True, exist_ok=True)
-                written = 0
+                region_dirs: Dict[str, Path] = {}
+                splits = []
                 for e in entries:
                     name = e.get("name") or e.get("id") or "creature"
-                    safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
-                    reg = e.get("region") or "Uncategorized"
-                    reg_safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in str(reg))
-                    sub = outdir / reg_safe
-                    sub.mkdir(parents=True, exist_ok=True)
-                    save_json_util(sub / f"{safe}.json", e)
-                    written += 1
+                    safe = safe_filename(name)
+                    reg = str(e.get("region") or "Uncategorized")
+                    sub = region_dirs.get(reg)
+                    if sub is None:
+                        sub = region_dirs[reg] = outdir / safe_filename(reg)
+                    splits.append((sub / f"{safe}.json", e))
+                # write_json_files creates each region folder once
+                write_json_files(splits)
+                written = len(splits)
                 # Build region bundles
                 try:
                     from scripts.format_creatures import build_region_bundles as _bundles
                     bundles = _bundles(entries)
                     base = outdir / "regions"
-                    base.mkdir(parents=True, exist_ok=True)
-                    for region, data in bundles.items():
-                        rsafe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in region)
-                        save_json_util(base / f"{rsafe}.json", data)
+                    write_json_files([
+                        (base / f"{safe_filename(region)}.json", data) for region, data in bundles.items()
+                    ])
                 except Exception:
                     pass
                 # Rewrite source to compact index with backup
                 try:
-                    orig = src.read_text(encoding="utf-8")
-                    (src.parent / "creatures.json.bak").write_text(orig, encoding="utf-8")
+                    backup_file(src, src.parent / "creatures.json.bak")
                 except Exception:
                     pass
                 compact = {
@@ -823,21 +1191,18 @@ def _start_scheduler_if_enabled():
             if normalize_magic_file is None:
                 return
             formatted = LORE_ROOT / "magic" / "formatted"
-            existing = list(formatted.glob("**/*.json")) if formatted.exists() else []
+            existing = count_json_files(formatted, limit=5)
             src = LORE_ROOT / "magic" / "magic_and_abilities.json"
-            if len(existing) < 5 and src.exists():
+            if existing < 5 and src.exists() and not is_compact_source(src):
                 entries = normalize_magic_file(src)
-                written = 0
-                formatted.mkdir(parents=True, exist_ok=True)
-                for e in entries:
-                    name = e.get("name") or e.get("id") or "magic"
-                    safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
-                    save_json_util(formatted / f"{safe}.json", e)
-                    written += 1
+                write_json_files([
+                    (formatted / f"{safe_filename(e.get('name') or e.get('id') or 'magic')}.json", e)
+                    for e in entries
+                ])
+                written = len(entries)
                 # backup + compact
                 try:
-                    orig = src.read_text(encoding="utf-8")
-                    (src.parent / "magic_and_abilities.json.bak").write_text(orig, encoding="utf-8")
+                    backup_file(src, src.parent / "magic_and_abilities.json.bak")
                 except Exception:
                     pass
                 compact = {"note": "Data split into lore/magic/formatted", "total": len(entries)}
@@ -851,21 +1216,18 @@ def _start_scheduler_if_enabled():
             if normalize_plots_file is None:
                 return
             formatted = LORE_ROOT / "plots" / "formatted"
-            existing = list(formatted.glob("**/*.json")) if formatted.exists() else []
+            existing = count_json_files(formatted, limit=3)
             src = LORE_ROOT / "plots" / "Plots.json"
-            if len(existing) < 3 and src.exists():
+            if existing < 3 and src.exists() and not is_compact_source(src):
                 entries = normalize_plots_file(src)
-                written = 0
-                formatted.mkdir(parents=True, exist_ok=True)
-                for e in entries:
-                    name = e.get("name") or e.get("id") or "plot"
-                    safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
-                    save_json_util(formatted / f"{safe}.json", e)
-                    written += 1
+                write_json_files([
+                    (formatted / f"{safe_filename(e.get('name') or e.get('id') or 'plot')}.json", e)
+                    for e in entries
+                ])
+                written = len(entries)
                 # backup + compact
                 try:
-                    orig = src.read_text(encoding="utf-8")
-                    (src.parent / "Plots.json.bak").write_text(orig, encoding="utf-8")
+                    backup_file(src, src.parent / "Plots.json.bak")
                 except Exception:
                     pass
                 compact = {"note": "Data split into lore/plots/formatted", "total": len(entries)}
@@ -879,21 +1241,18 @@ def _start_scheduler_if_enabled():
             if normalize_realms_file is None:
                 return
             formatted = LORE_ROOT / "realms" / "formatted"
-            existing = list(formatted.glob("**/*.json")) if formatted.exists() else []
+            existing = count_json_files(formatted, limit=3)
             src = LORE_ROOT / "realms" / "realms.json"
-            if len(existing) < 3 and src.exists():
+            if existing < 3 and src.exists() and not is_compact_source(src):
                 entries = normalize_realms_file(src)
-                written = 0
-                formatted.mkdir(parents=True, exist_ok=True)
-                for e in entries:
-                    name = e.get("name") or e.get("id") or "realm"
-                    safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
-                    save_json_util(formatted / f"{safe}.json", e)
-                    written += 1
+                write_json_files([
+                    (formatted / f"{safe_filename(e.get('name') or e.get('id') or 'realm')}.json", e)
+                    for e in entries
+                ])
+                written = len(entries)
                 # backup + compact
                 try:
-                    orig = src.read_text(encoding="utf-8")
-                    (src.parent / "realms.json.bak").write_text(orig, encoding="utf-8")
+                    backup_file(src, src.parent / "realms.json.bak")
                 except Exception:
                     pass
                 compact = {"note": "Data split into lore/realms/formatted", "total": len(entries)}
@@ -909,16 +1268,33 @@ def _start_scheduler_if_enabled():
         _maybe_refactor_magic()
         _maybe_refactor_plots()
         _maybe_refactor_realms()
+        # Random jitter spreads instances restarted together so they do not hit Notion at the same moment
+        if _SCHEDULER_STOP.wait(random.uniform(0, jitter_seconds)):
+            return
         if pull_on_start:
             _do_pull_all_internal()
         if publish_on_start:
             _do_publish_all_internal()
-        while True:
-            time.sleep(interval_minutes * 60)
+        # Cycles are anchored to a fixed monotonic schedule so sync time does not push later runs back;
+        # a cycle that overruns skips the slots it missed instead of running back to back.
+        interval = max(interval_minutes * 60, 1)
+        failures = 0
+        next_run = time.monotonic() + interval
+        while not _SCHEDULER_STOP.wait(max(0.0, next_run - time.monotonic()) + random.uniform(0, jitter_seconds)):
+            outcomes = []
             if pull_each_cycle:
-                _do_pull_all_internal()
+                outcomes.extend(_do_pull_all_internal().values())
             if publish_each_cycle:
-                _do_publish_all_internal()
+                outcomes.extend(_do_publish_all_internal().values())
+            # Back off (up to 8x the interval) while every category keeps failing, e.g. during a Notion outage
+            if outcomes and all(isinstance(r, dict) and "error" in r for r in outcomes):
+                failures += 1
+            else:
+                failures = 0
+            gap = interval * 2 ** min(failures, 3)
+            next_run += gap
+            while next_run <= time.monotonic():
+                next_run += gap
 
     try:
         t = threading.Thread(target=worker, name="auto-sync", daemon=True)
@@ -933,14 +1309,30 @@ _start_scheduler_if_enabled()
 
 
 # -------- HEALTH CHECKS --------
+# Short timeout so a hung Notion endpoint cannot stall the health probe
+HEALTH_TIMEOUT_MS = 2000
+# Successful probes are reused for this many seconds (bypass with ?force=1)
+HEALTH_CACHE_TTL = 30.0
+_health_client = None
+_health_cache: Dict[str, Any] = {"t": 0.0, "status": None}
+
+
+def _get_health_client():
+    """Return a cached Notion client for health probes, built on first use."""
+    global _health_client
+    if _health_client is None and NOTION_TOKEN:
+        try:
+            _health_client = Client(auth=NOTION_TOKEN, timeout_ms=HEALTH_TIMEOUT_MS)
+        except Exception:
+            _health_client = None
+    return _health_client
+
+
 @app.route('/health/notion', methods=['GET'])
 def health_notion():
-    token_present = bool(os.getenv("NOTION_TOKEN"))
-    char_db_id = os.getenv("CHARACTER_DB_ID")
-    try:
-        client = Client(auth=os.getenv("NOTION_TOKEN")) if token_present else None
-    except Exception:
-        client = None
+    token_present = bool(NOTION_TOKEN)
+    char_db_id = NOTION_DATABASES.get("characters")
+    client = _get_health_client()
     status = {
         "token_present": token_present,
         "character_db_id": char_db_id,
@@ -950,20 +1342,31 @@ def health_notion():
     }
     if not token_present:
         status["message"] = "NOTION_TOKEN missing"
-        return jsonify(status)
+        return json_response(status)
     if not char_db_id:
         status["message"] = "CHARACTER_DB_ID missing"
-        return jsonify(status)
+        return json_response(status)
     if client is None:
         status["message"] = "Failed to initialize Notion client"
-        return jsonify(status)
+        return json_response(status)
+    cached = _health_cache["status"]
+    if (
+        cached is not None
+        and time.monotonic() - _health_cache["t"] < HEALTH_CACHE_TTL
+        and request.args.get("force") != "1"
+    ):
+        return json_response(cached)
     try:
+        if get_rate_limiter is not None:
+            get_rate_limiter(NOTION_TOKEN).acquire()
         client.databases.query(database_id=char_db_id, page_size=1)
         status["access_ok"] = True
         status["message"] = "OK"
+        _health_cache["status"] = status
+        _health_cache["t"] = time.monotonic()
     except Exception as e:
         status["message"] = f"Query failed: {e}"
-    return jsonify(status)
+    return json_response(status)
 
 
 # -------- MAPPING VALIDATOR --------
@@ -972,7 +1375,7 @@ def validate_mapping(category):
     try:
         from scripts.notion_sync import get_env_client_for, get_db_property_types, load_mapping
     except Exception as e:
-        return jsonify({"error": f"Validator unavailable: {e}"}), 500
+        return json_response({"error": f"Validator unavailable: {e}"}, 500)
     try:
         notion, db_id = get_env_client_for(category)
         actual = get_db_property_types(notion, db_id)
@@ -987,14 +1390,14 @@ def validate_mapping(category):
             elif atype != mtype:
                 mismatches.append({"property": prop, "mapping_type": mtype, "actual_type": atype})
         extras = [p for p in actual.keys() if p not in mp]
-        return jsonify({
+        return json_response({
             "database_id": db_id,
             "missing_in_db": missing,
             "type_mismatches": mismatches,
             "unmapped_properties": extras,
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
 
 
 # -------- SIMPLE WEB DASHBOARD --------
@@ -1104,46 +1507,58 @@ def serve_main_css():
 def get_lore():
     subject = request.args.get("subject")
 
-    # Search across all categories for exact match
+    if LOOKUP_PATH.exists():
+        hit = load_json_cached(LOOKUP_PATH).get(subject)
+        if hit:
+            lore_file = LORE_ROOT / hit["file"]
+            if lore_file.exists():
+                return json_response({
+                    "subject": subject,
+                    "category": hit["category"],
+                    "content": load_lore_cached(lore_file)
+                })
+        return json_response({"error": f"No lore entry found for '{subject}'"}, 404)
+
+    # Indexes generated before lookup.json existed: search across all categories for exact match
     for category in CATEGORIES:
         index_path = INDEX_DIR / f"{category}_index.json"
         if not index_path.exists():
             continue
 
-        with open(index_path, "r", encoding="utf-8") as f:
-            entries = json.load(f)
+        entries = load_json_cached(index_path)
 
         for entry in entries:
             if entry["name"] == subject:
                 # Locate and load the JSON file
                 lore_file = LORE_ROOT / entry["file"]
                 if lore_file.exists():
-                    with open(lore_file, "r", encoding="utf-8") as lf:
-                        lore_data = json.load(lf)
-                    return jsonify({
+                    lore_data = load_lore_cached(lore_file)
+                    return json_response({
                         "subject": subject,
                         "category": category,
                         "content": lore_data
                     })
 
-    return jsonify({"error": f"No lore entry found for '{subject}'"}), 404
+    return json_response({"error": f"No lore entry found for '{subject}'"}, 404)
 
 
 # -------- NORMALIZATION ROUTE --------
-@app.route('/normalize-characters', methods=['POST', 'GET'])
-def normalize_characters_route():
-    if normalize_character_file is None:
-        return jsonify({"error": "Character normalizer module not available"}), 500
+def _run_normalize(kind, fallback_name, normalize_file, load_synonyms, set_synonyms, build_index,
+                   build_region_bundles=None):
+    """Shared body of the /normalize-<kind> routes.
 
-    # Defaults
-    default_input = LORE_ROOT / "characters" / "characters.json"
-    default_outdir = LORE_ROOT / "characters" / "formatted"
+    Passing build_region_bundles enables the creatures-style "by_region" and "region_bundles" options.
+    """
+    default_input = LORE_ROOT / kind / f"{kind}.json"
+    default_outdir = LORE_ROOT / kind / "formatted"
     payload = request.get_json(silent=True) or {}
 
     input_path = payload.get("input")
     scan_dir = payload.get("scan")
     outdir = Path(payload.get("outdir") or default_outdir)
     split = bool(payload.get("split", True))
+    by_region = build_region_bundles is not None and bool(payload.get("by_region", False))
+    region_bundles = build_region_bundles is not None and bool(payload.get("region_bundles", False))
     write_index = bool(payload.get("index", True))
     output_combined = payload.get("output")
     mappings_path = payload.get("mappings")
@@ -1152,145 +1567,95 @@ def normalize_characters_route():
     if input_path:
         inputs = [Path(input_path)]
     elif scan_dir:
-        inputs = list(Path(scan_dir).glob("*.json"))
+        inputs = list_json(scan_dir)
     elif default_input.exists():
         inputs = [default_input]
     else:
-        return jsonify({"error": "No input provided and default characters.json not found"}), 400
+        return json_response({"error": f"No input provided and default {kind}.json not found"}, 400)
 
     # Load synonyms and set in module
     if mappings_path:
-        synonyms = load_character_synonyms(Path(mappings_path))
-    else:
-        default_map = LORE_ROOT / "characters" / "mappings.json"
-        synonyms = load_character_synonyms(default_map)
-    set_character_synonyms(synonyms)
-
-    all_entries = []
-    for p in inputs:
-        try:
-            all_entries.extend(normalize_character_file(p))
-        except Exception as e:
-            return jsonify({"error": f"Failed to normalize {p}", "details": str(e)}), 500
-
-    written_files = []
-    if split:
-        outdir.mkdir(parents=True, exist_ok=True)
-        for e in all_entries:
-            name = e.get("name") or e.get("id") or "character"
-            safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
-            path = outdir / f"{safe}.json"
-            save_json_util(path, e)
-            written_files.append(str(path))
-        if write_index:
-            idx_path = outdir / "_index.json"
-            save_json_util(idx_path, build_character_index(all_entries))
-            written_files.append(str(idx_path))
-
-    if output_combined:
-        out_path = Path(output_combined)
-        save_json_util(out_path, {"characters": all_entries})
-        written_files.append(str(out_path))
-
-    return jsonify({
-        "status": "ok",
-        "count": len(all_entries),
-        "written": written_files,
-    })
-
-
-# -------- CREATURES NORMALIZATION ROUTE --------
-@app.route('/normalize-creatures', methods=['POST', 'GET'])
-def normalize_creatures_route():
-    if normalize_creatures_file is None:
-        return jsonify({"error": "Creatures normalizer module not available"}), 500
-
-    default_input = LORE_ROOT / "creatures" / "creatures.json"
-    default_outdir = LORE_ROOT / "creatures" / "formatted"
-    payload = request.get_json(silent=True) or {}
-
-    input_path = payload.get("input")
-    scan_dir = payload.get("scan")
-    outdir = Path(payload.get("outdir") or default_outdir)
-    split = bool(payload.get("split", True))
-    by_region = bool(payload.get("by_region", False))
-    region_bundles = bool(payload.get("region_bundles", False))
-    write_index = bool(payload.get("index", True))
-    output_combined = payload.get("output")
-    mappings_path = payload.get("mappings")
-
-    inputs: List[Path] = []
-    if input_path:
-        inputs = [Path(input_path)]
-    elif scan_dir:
-        inputs = list(Path(scan_dir).glob("*.json"))
-    elif default_input.exists():
-        inputs = [default_input]
-    else:
-        return jsonify({"error": "No input provided and default creatures.json not found"}), 400
-
-    # Synonyms
-    if mappings_path:
-        synonyms = load_creatures_synonyms(Path(mappings_path))
+        synonyms = cached_synonyms(load_synonyms, Path(mappings_path))
     else:
-        default_map = LORE_ROOT / "creatures" / "mappings.json"
-        synonyms = load_creatures_synonyms(default_map)
-    set_creatures_synonyms(synonyms)
+        default_map = LORE_ROOT / kind / "mappings.json"
+        synonyms = cached_synonyms(load_synonyms, default_map)
+    set_synonyms(synonyms)
 
     all_entries = []
     for p in inputs:
         try:
-            all_entries.extend(normalize_creatures_file(p))
+            all_entries.extend(normalize_file(p))
         except Exception as e:
-            return jsonify({"error": f"Failed to normalize {p}", "details": str(e)}), 500
+            return json_response({"error": f"Failed to normalize {p}", "details": str(e)}, 500)
 
     written_files = []
     if split:
         outdir.mkdir(parents=True, exist_ok=True)
+        region_dirs: Dict[str, Path] = {}
+        splits = []
         for e in all_entries:
-            name = e.get("name") or e.get("id") or "creature"
-            safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
+            name = e.get("name") or e.get("id") or fallback_name
+            safe = safe_filename(name)
             # Optional region subfolder
             subdir = outdir
             if by_region:
-                reg = e.get("region") or "Uncategorized"
-                reg_safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in str(reg))
-                subdir = outdir / reg_safe
-                subdir.mkdir(parents=True, exist_ok=True)
-            path = subdir / f"{safe}.json"
-            save_json_util(path, e)
-            written_files.append(str(path))
+                reg = str(e.get("region") or "Uncategorized")
+                subdir = region_dirs.get(reg)
+                if subdir is None:
+                    subdir = region_dirs[reg] = outdir / safe_filename(reg)
+            splits.append((subdir / f"{safe}.json", e))
+        written_files.extend(write_json_files(splits))
         if write_index:
             idx_path = outdir / "_index.json"
-            save_json_util(idx_path, build_creatures_index(all_entries))
+            save_json_util(idx_path, build_index(all_entries))
             written_files.append(str(idx_path))
 
         if region_bundles:
-            bundles = build_creatures_region_bundles(all_entries)
+            bundles = build_region_bundles(all_entries)
             base = outdir / "regions"
-            for region, data in bundles.items():
-                rsafe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in region)
-                rpath = base / f"{rsafe}.json"
-                save_json_util(rpath, data)
-                written_files.append(str(rpath))
+            written_files.extend(write_json_files([
+                (base / f"{safe_filename(region)}.json", data) for region, data in bundles.items()
+            ]))
 
     if output_combined:
         out_path = Path(output_combined)
-        save_json_util(out_path, {"creatures": all_entries})
+        dump_json_list(out_path, kind, all_entries)
         written_files.append(str(out_path))
 
-    return jsonify({
+    return json_response({
         "status": "ok",
         "count": len(all_entries),
         "written": written_files,
     })
 
 
+@app.route('/normalize-characters', methods=['POST', 'GET'])
+def normalize_characters_route():
+    if normalize_character_file is None:
+        return json_response({"error": "Character normalizer module not available"}, 500)
+    return _run_normalize(
+        "characters", "character", normalize_character_file,
+        load_character_synonyms, set_character_synonyms, build_character_index,
+    )
+
+
+# -------- CREATURES NORMALIZATION ROUTE --------
+@app.route('/normalize-creatures', methods=['POST', 'GET'])
+def normalize_creatures_route():
+    if normalize_creatures_file is None:
+        return json_response({"error": "Creatures normalizer module not available"}, 500)
+    return _run_normalize(
+        "creatures", "creature", normalize_creatures_file,
+        load_creatures_synonyms, set_creatures_synonyms, build_creatures_index,
+        build_region_bundles=build_creatures_region_bundles,
+    )
+
+
 # -------- CREATURES REFACTOR (split + rewrite source as lightweight index) --------
 @app.route('/refactor-creatures', methods=['POST', 'GET'])
 def refactor_creatures_route():
     if normalize_creatures_file is None:
-        return jsonify({"error": "Creatures normalizer module not available"}), 500
+        return json_response({"error": "Creatures normalizer module not available"}, 500)
 
     default_input = LORE_ROOT / "creatures" / "creatures.json"
     default_outdir = LORE_ROOT / "creatures" / "formatted"
@@ -1305,34 +1670,40 @@ def refactor_creatures_route():
 
     # Synonyms
     if mappings_path:
-        synonyms = load_creatures_synonyms(Path(mappings_path))
+        synonyms = cached_synonyms(load_creatures_synonyms, Path(mappings_path))
     else:
         default_map = LORE_ROOT / "creatures" / "mappings.json"
-        synonyms = load_creatures_synonyms(default_map)
+        synonyms = cached_synonyms(load_creatures_synonyms, default_map)
     set_creatures_synonyms(synonyms)
 
+    # A compact source holds no entries; refactoring it again would rewrite creatures.json with total 0
+    # and replace creatures.json.bak with the compact index
+    if is_compact_source(input_path):
+        return json_response({"error": f"{input_path} is already refactored; restore it from creatures.json.bak first"}, 400)
+
     # Normalize from the single source file
     try:
         entries = normalize_creatures_file(input_path)
     except Exception as e:
-        return jsonify({"error": f"Failed to normalize {input_path}", "details": str(e)}), 500
+        return json_response({"error": f"Failed to normalize {input_path}", "details": str(e)}, 500)
 
     written: List[str] = []
 
     # Write per-creature split files (nested by region if requested)
     outdir.mkdir(parents=True, exist_ok=True)
+    region_dirs: Dict[str, Path] = {}
+    splits = []
     for e in entries:
         name = e.get("name") or e.get("id") or "creature"
-        safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
+        safe = safe_filename(name)
         sub = outdir
         if by_region:
-            reg = e.get("region") or "Uncategorized"
-            reg_safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in str(reg))
-            sub = outdir / reg_safe
-            sub.mkdir(parents=True, exist_ok=True)
-        path = sub / f"{safe}.json"
-        save_json_util(path, e)
-        written.append(str(path))
+            reg = str(e.get("region") or "Uncategorized")
+            sub = region_dirs.get(reg)
+            if sub is None:
+                sub = region_dirs[reg] = outdir / safe_filename(reg)
+        splits.append((sub / f"{safe}.json", e))
+    written.extend(write_json_files(splits))
 
     # Build and write region bundles
     bundle_index = []
@@ -1340,16 +1711,15 @@ def refactor_creatures_route():
         try:
             from scripts.format_creatures import build_region_bundles as _build_bundles
         except Exception as e:
-            return jsonify({"error": "Region bundle helper missing", "details": str(e)}), 500
+            return json_response({"error": "Region bundle helper missing", "details": str(e)}, 500)
         bundles = _build_bundles(entries)
         base = outdir / "regions"
         base.mkdir(parents=True, exist_ok=True)
-        for region, data in bundles.items():
-            rsafe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in region)
-            rpath = base / f"{rsafe}.json"
-            save_json_util(rpath, data)
-            bundle_index.append({"region": region, "file": str(rpath)})
-            written.append(str(rpath))
+        bundle_files = write_json_files([
+            (base / f"{safe_filename(region)}.json", data) for region, data in bundles.items()
+        ])
+        bundle_index = [{"region": region, "file": f} for region, f in zip(bundles, bundle_files)]
+        written.extend(bundle_files)
 
     # Rewrite the original creatures.json to a compact index
     if rewrite_source and default_input.exists():
@@ -1359,17 +1729,17 @@ def refactor_creatures_route():
             "note": "Data split into lore/creatures/formatted (per-creature) and lore/creatures/formatted/regions (bundles).",
         }
         try:
-            # simple backup
+            # simple backup; input_path was checked above, so only a separate default_input needs checking
             try:
-                orig_text = default_input.read_text(encoding="utf-8")
-                (default_input.parent / "creatures.json.bak").write_text(orig_text, encoding="utf-8")
+                if input_path == default_input or not is_compact_source(default_input):
+                    backup_file(default_input, default_input.parent / "creatures.json.bak")
             except Exception:
                 pass
             save_json_util(default_input, compact)
         except Exception as e:
-            return jsonify({"error": "Failed to rewrite source creatures.json", "details": str(e)}), 500
+            return json_response({"error": "Failed to rewrite source creatures.json", "details": str(e)}, 500)
 
-    return jsonify({
+    return json_response({
         "status": "ok",
         "split_count": len(entries),
         "bundle_count": len(bundle_index),
@@ -1382,76 +1752,18 @@ def refactor_creatures_route():
 @app.route('/normalize-realms', methods=['POST', 'GET'])
 def normalize_realms_route():
     if normalize_realms_file is None:
-        return jsonify({"error": "Realms normalizer module not available"}), 500
-
-    default_input = LORE_ROOT / "realms" / "realms.json"
-    default_outdir = LORE_ROOT / "realms" / "formatted"
-    payload = request.get_json(silent=True) or {}
-
-    input_path = payload.get("input")
-    scan_dir = payload.get("scan")
-    outdir = Path(payload.get("outdir") or default_outdir)
-    split = bool(payload.get("split", True))
-    write_index = bool(payload.get("index", True))
-    output_combined = payload.get("output")
-    mappings_path = payload.get("mappings")
-
-    inputs: List[Path] = []
-    if input_path:
-        inputs = [Path(input_path)]
-    elif scan_dir:
-        inputs = list(Path(scan_dir).glob("*.json"))
-    elif default_input.exists():
-        inputs = [default_input]
-    else:
-        return jsonify({"error": "No input provided and default realms.json not found"}), 400
-
-    # Synonyms
-    if mappings_path:
-        synonyms = load_realms_synonyms(Path(mappings_path))
-    else:
-        default_map = LORE_ROOT / "realms" / "mappings.json"
-        synonyms = load_realms_synonyms(default_map)
-    set_realms_synonyms(synonyms)
-
-    all_entries = []
-    for p in inputs:
-        try:
-            all_entries.extend(normalize_realms_file(p))
-        except Exception as e:
-            return jsonify({"error": f"Failed to normalize {p}", "details": str(e)}), 500
-
-    written_files = []
-    if split:
-        outdir.mkdir(parents=True, exist_ok=True)
-        for e in all_entries:
-            name = e.get("name") or e.get("id") or "realm"
-            safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
-            path = outdir / f"{safe}.json"
-            save_json_util(path, e)
-            written_files.append(str(path))
-        if write_index:
-            idx_path = outdir / "_index.json"
-            save_json_util(idx_path, build_realms_index(all_entries))
-            written_files.append(str(idx_path))
-
-    if output_combined:
-        out_path = Path(output_combined)
-        save_json_util(out_path, {"realms": all_entries})
-        written_files.append(str(out_path))
-
-    return jsonify({
-        "status": "ok",
-        "count": len(all_entries),
-        "written": written_files,
-    })
+        return json_response({"error": "Realms normalizer module not available"}, 500)
+    return _run_normalize(
+        "realms", "realm", normalize_realms_file,
+        load_realms_synonyms, set_realms_synonyms, build_realms_index,
+    )
 
 
 # -------- REALMS REFACTOR (split + rewrite source as lightweight index) --------
 @app.route('/refactor-realms', methods=['POST', 'GET'])
 def refactor_realms_route():
     if normalize_realms_file is None:
-        return jsonify({"error": "Realms normalizer module not available"}), 500
+        return json_response({"error": "Realms normalizer module not available"}, 500)
 
     default_input = LORE_ROOT / "realms" / "realms.json"
     default_outdir = LORE_ROOT / "realms" / "formatted"
@@ -1464,48 +1776,49 @@ def refactor_realms_route():
 
     # Synonyms
     if mappings_path:
-        synonyms = load_realms_synonyms(Path(mappings_path))
+        synonyms = cached_synonyms(load_realms_synonyms, Path(mappings_path))
     else:
         default_map = LORE_ROOT / "realms" / "mappings.json"
-        synonyms = load_realms_synonyms(default_map)
+        synonyms = cached_synonyms(load_realms_synonyms, default_map)
     set_realms_synonyms(synonyms)
 
+    # A compact source holds no entries; refactoring it again would rewrite realms.json with total 0
+    # and replace realms.json.bak with the compact index
+    if is_compact_source(input_path):
+        return json_response({"error": f"{input_path} is already refactored; restore it from realms.json.bak first"}, 400)
+
     # Normalize from the single source file
     try:
         entries = normalize_realms_file(input_path)
     except Exception as e:
-        return jsonify({"error": f"Failed to normalize {input_path}", "details": str(e)}), 500
+        return json_response({"error": f"Failed to normalize {input_path}", "details": str(e)}, 500)
 
     written: List[str] = []
 
     # Write per-realm split files
-    outdir.mkdir(parents=True, exist_ok=True)
-    for e in entries:
-        name = e.get("name") or e.get("id") or "realm"
-        safe = "".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in name)
-        path = outdir / f"{safe}.json"
-        save_json_util(path, e)
-        written.append(str(path))
+    written.extend(write_json_files([
+        (outdir / f"{safe_filename(e.get('name') or e.get('id') or 'realm')}.json", e) for e in entries
+    ]))
 
     # Rewrite the original realms.json to a compact index
     if rewrite_source and default_input.exists():
         compact = {
-            "realms_index": [{"name": e.get("name"), "file": str((outdir / ("".join(c if c.isalnum() or c in (".", "_", "-") else "_" for c in (e.get("name") or e.get("id") or "realm")) + ".json")).relative_to(LORE_ROOT))} for e in entries],
+            "realms_index": [{"name": e.get("name"), "file": lore_relpath(outdir / (safe_filename(e.get("name") or e.get("id") or "realm") + ".json"))} for e in entries],
             "total": len(entries),
             "note": "Data split into lore/realms/formatted (per-realm).",
         }
         try:
-            # simple backup
+            # simple backup; input_path was checked above, so only a separate default_input needs checking
             try:
-                orig_text = default_input.read_text(encoding="utf-8")
-                (default_input.parent / "realms.json.bak").write_text(orig_text, encoding="utf-8")
+                if input_path == default_input or not is_compact_source(default_input):
+                    backup_file(default_input, default_input.parent / "realms.json.bak")
             except Exception:
                 pass
             save_json_util(default_input, compact)
         except Exception as e:
-            return jsonify({"error": "Failed to rewrite source realms.json", "details": str(e)}), 500
+            return json_response({"error": "Failed to rewrite source realms.json", "details": str(e)}, 500)
 
-    return jsonify({
+    return json_response({
         "status": "ok",
         "split_count": len(entries),
         "written": written,
@@ -1514,5 +1827,6 @@ def refactor_realms_route():
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Debug mode enables the reloader, which would start a second scheduler; opt in with FLASK_DEBUG=true
+    app.run(debug=_bool_env("FLASK_DEBUG", False), threaded=True)
 
@@ -23,6 +23,11 @@ import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when unavailable
+    orjson = None
+
 
 # ---------------- Text cleanup utilities ----------------
 RE_WS = re.compile(r"\s+")
@@ -302,12 +307,17 @@ def normalize_character(entry: Dict[str, Any], context: Dict[str, Any]) -> Dict[
 
 
 def load_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
 def save_json(path: Path, data: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with path.open("w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
@@ -414,7 +424,7 @@ def load_synonyms(path: Optional[Path]) -> Dict[str, Dict[str, str]]:
     if not path.exists():
         return merged
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = load_json(path)
         for section, m in data.items():
             if not isinstance(m, dict):
                 continue
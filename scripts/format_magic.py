@@ -6,6 +6,11 @@ import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when unavailable
+    orjson = None
+
 
 def clean(s: Optional[str]) -> Optional[str]:
     if s is None:
@@ -15,11 +20,16 @@ def clean(s: Optional[str]) -> Optional[str]:
 
 
 def load(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     return json.loads(path.read_text(encoding="utf-8"))
 
 
 def save(path: Path, data: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
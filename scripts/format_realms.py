@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 from scripts.format_characters import (
     clean_text,
     clean_list,
+    load_json,
     save_json,
     load_synonyms,
     set_synonyms,
@@ -62,7 +63,7 @@ def normalize_realm(entry: Dict[str, Any], context: Dict[str, Any]) -> Dict[str,
 
 
 def normalize_file(path: Path) -> List[Dict[str, Any]]:
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = load_json(path)
     result: List[Dict[str, Any]] = []
 
     if isinstance(data, dict):
@@ -21,11 +21,18 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import hashlib
+import threading
 import time
 
+import httpx
 from notion_client import Client
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when unavailable
+    orjson = None
+
 
 load_dotenv()
 
@@ -72,11 +79,16 @@ CATEGORY_LABEL: Dict[str, str] = {
 
 
 def load_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     return json.loads(path.read_text(encoding="utf-8"))
 
 
 def save_json(path: Path, data: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
@@ -89,9 +101,76 @@ def _with_retry(func, *args, **kwargs):
         except Exception as e:
             if i == len(delays) - 1:
                 raise
+            # Rate-limited: wait as long as Notion asks
+            if getattr(e, "status", None) == 429:
+                try:
+                    d = max(d, float((getattr(e, "headers", None) or {}).get("Retry-After")))
+                except (TypeError, ValueError):
+                    pass
             time.sleep(d)
 
 
+# Notion allows ~3 requests/second per integration; every request made through get_client() for a
+# token draws from one shared budget, so concurrent category syncs cannot burst past it.
+NOTION_RATE_LIMIT = float(os.getenv("NOTION_RATE_LIMIT", "3"))
+
+
+class _RateLimiter:
+    """Thread-safe token bucket; acquire() blocks until a request slot is available."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_LIMITERS: Dict[str, _RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(token: str) -> _RateLimiter:
+    """Return the request budget shared by every Notion call made with this token."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(token)
+        if limiter is None:
+            limiter = _LIMITERS[token] = _RateLimiter(NOTION_RATE_LIMIT)
+        return limiter
+
+
+# One client per token, so repeated syncs reuse keep-alive connections instead of a new TLS handshake each time
+_CLIENTS: Dict[str, Client] = {}
+_CLIENTS_LOCK = threading.Lock()
+NOTION_POOL_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+
+def get_client(token: str) -> Client:
+    """Return the pooled client for token; each HTTP request it sends waits on get_rate_limiter(token)."""
+    limiter = get_rate_limiter(token)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(token)
+        if client is None:
+            http = httpx.Client(
+                limits=NOTION_POOL_LIMITS,
+                event_hooks={"request": [lambda request: limiter.acquire()]},
+            )
+            client = Client(auth=token, client=http)
+            _CLIENTS[token] = client
+        return client
+
+
 def get_env_client_for(category: str) -> tuple[Client, str]:
     token = os.getenv("NOTION_TOKEN")
     if not token:
@@ -108,7 +187,7 @@ def get_env_client_for(category: str) -> tuple[Client, str]:
     db_id = os.getenv(env_key)
     if not db_id:
         raise ValueError(f"{env_key} is not set")
-    return Client(auth=token), db_id
+    return get_client(token), db_id
 
 
 def load_mapping(path: Optional[Path] = None, *, category: Optional[str] = None) -> Dict[str, Dict[str, str]]:
@@ -306,7 +385,7 @@ def _load_syncstate(category: str) -> Dict[str, Any]:
     p = _syncstate_path(category)
     if p.exists():
         try:
-            return json.loads(p.read_text(encoding="utf-8"))
+            return load_json(p)
         except Exception:
             return {}
     return {}
@@ -314,7 +393,7 @@ def _load_syncstate(category: str) -> Dict[str, Any]:
 
 def _save_syncstate(category: str, state: Dict[str, Any]) -> None:
     p = _syncstate_path(category)
-    p.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+    save_json(p, state)
 
 
 def _hash_mapped(entry: Dict[str, Any], mapping: Dict[str, Dict[str, str]], actual_types: Optional[Dict[str, str]]) -> str:
@@ -328,12 +407,34 @@ def _hash_mapped(entry: Dict[str, Any], mapping: Dict[str, Dict[str, str]], actu
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
+def _title_index(notion: Client, db_id: str) -> Dict[str, str]:
+    """Map page title (Name) -> page id for every page in the database, in one paginated scan."""
+    index: Dict[str, str] = {}
+    start_cursor: Optional[str] = None
+    while True:
+        kwargs: Dict[str, Any] = {"database_id": db_id, "page_size": 100}
+        if start_cursor:
+            kwargs["start_cursor"] = start_cursor
+        page = _with_retry(notion.databases.query, **kwargs)
+        for result in page.get("results", []):
+            title = result.get("properties", {}).get("Name", {}).get("title") or []
+            name = "".join(t.get("plain_text", "") for t in title)
+            if name:
+                index.setdefault(name, result["id"])
+        if not page.get("has_more"):
+            break
+        start_cursor = page.get("next_cursor")
+    return index
+
+
 def push_to_notion(category: str, mapping_path: Optional[Path] = None) -> Dict[str, Any]:
     notion, db_id = get_env_client_for(category)
     mapping = load_mapping(mapping_path, category=category)
     files = list_files_for(category)
     actual_types = get_db_property_types(notion, db_id)
     state = _load_syncstate(category)
+    # Name -> page id, fetched on the first entry that has no known page id
+    by_title: Optional[Dict[str, str]] = None
 
     created = 0
     updated = 0
@@ -388,17 +489,17 @@ def push_to_notion(category: str, mapping_path: Optional[Path] = None) -> Dict[s
                     used_page_id = None
             if not used_page_id:
                 # Fallback to matching by Name
-                res = _with_retry(notion.databases.query,
-                    database_id=db_id,
-                    filter={"property": "Name", "title": {"equals": name}},
-                )
-                if res.get("results"):
-                    used_page_id = res["results"][0]["id"]
+                if by_title is None:
+                    by_title = _title_index(notion, db_id)
+                used_page_id = by_title.get(name)
+                if used_page_id:
                     _with_retry(notion.pages.update, page_id=used_page_id, properties=props)
                     updated += 1
                 else:
                     created_page = _with_retry(notion.pages.create, parent={"database_id": db_id}, properties=props)
                     used_page_id = created_page.get("id")
+                    if used_page_id:
+                        by_title[name] = used_page_id
                     created += 1
 
             # Save notion_page_id back to the file for future updates